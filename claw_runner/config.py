@@ -1,8 +1,25 @@
 import json
 import os
-from dataclasses import dataclass, replace
-from pathlib import Path
-from typing import Any, Mapping
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+try:
+    # Optional: faster JSON when installed.
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# Both take UTF-8 bytes (or str) and raise ValueError subclasses on bad input.
+json_loads = _orjson.loads if _orjson is not None else json.loads
+
+
+def json_dumps_pretty(obj: object) -> bytes:
+    # 2-space indented UTF-8 JSON with a trailing newline.
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2) + b"\n"
+    return (json.dumps(obj, indent=2) + "\n").encode("utf-8")
 
 
 @dataclass(frozen=True)
@@ -22,44 +39,103 @@ class Config:
     terminal: str = ""
 
 
+# Shared defaults; Config is frozen so one instance is safe to hand out.
+_DEFAULT = Config()
+
+# Resolved once; $HOME does not change under a running service.
+CONFIG_PATH = os.path.expanduser("~/.config/claw-runner/config.json")
+
+# Config field -> accepted config.json keys (camelCase first, then
+# snake_case and legacy names), in precedence order.
+_FIELDS = (
+    ("dashboard_url", ("dashboardUrl", "dashboard_url")),
+    ("cli", ("cli", "binary", "command")),
+    ("gateway_service", ("gatewayService", "gateway_service")),
+    ("terminal", ("terminal",)),
+)
+
+# How long a "config.json does not exist" result is trusted before re-checking.
+_MISSING_TTL_S = 5.0
+
+# Monotonic timestamp of the last stat() that found no config file.
+_missing_since: Optional[float] = None
+
+
 def load_config() -> Config:
-    """Load ~/.config/claw-runner/config.json, falling back to defaults."""
+    """Load ~/.config/claw-runner/config.json, falling back to defaults.
+
+    The parsed result is cached and only re-read when the file's mtime or size
+    changes.
+    """
+
+    global _missing_since
 
-    path = Path(os.path.expanduser("~/.config/claw-runner/config.json"))
-    if not path.exists():
-        return Config()
+    # Default installs have no config file; skip the stat for a few seconds.
+    if _missing_since is not None and time.monotonic() - _missing_since < _MISSING_TTL_S:
+        return _DEFAULT
 
+    path = CONFIG_PATH
     try:
-        raw: Any = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        # Fail closed to defaults if the file is unreadable or invalid JSON.
-        return Config()
+        st = os.stat(path)
+    except FileNotFoundError:
+        _missing_since = time.monotonic()
+        return _DEFAULT
+    except OSError:
+        return _DEFAULT
 
-    if not isinstance(raw, Mapping):
-        return Config()
+    _missing_since = None
+    return _load(path, st.st_mtime_ns, st.st_size)
 
-    data: Mapping[str, Any] = raw
 
-    def pick(*keys: str) -> Any:
-        for k in keys:
-            if k in data:
-                return data.get(k)
-        return None
+# Last successfully parsed config. Served while the file is unreadable or
+# half-written (e.g. mid-save in an editor) instead of dropping to defaults.
+_last_good: Optional[Config] = None
 
-    cfg = Config()
 
-    dashboard_url = pick("dashboardUrl", "dashboard_url")
-    cli = pick("cli", "binary", "command")
-    gateway_service = pick("gatewayService", "gateway_service")
-    terminal = pick("terminal")
+@lru_cache(maxsize=1)
+def _load(path: str, mtime_ns: int, size: int) -> Config:
+    # mtime_ns and size are only part of the cache key. Size catches rewrites
+    # that land within the filesystem's timestamp granularity.
+    global _last_good
 
-    if isinstance(dashboard_url, str) and dashboard_url.strip():
-        cfg = replace(cfg, dashboard_url=dashboard_url.strip())
-    if isinstance(cli, str) and cli.strip():
-        cfg = replace(cfg, cli=cli.strip())
-    if isinstance(gateway_service, str) and gateway_service.strip():
-        cfg = replace(cfg, gateway_service=gateway_service.strip())
-    if isinstance(terminal, str) and terminal.strip():
-        cfg = replace(cfg, terminal=terminal.strip())
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except FileNotFoundError:
+        # Removed between the stat() and the open().
+        return _DEFAULT
+    except OSError:
+        return _last_good or _DEFAULT
 
+    try:
+        # Both decoders take UTF-8 bytes directly; no text-mode wrapper needed.
+        raw: Any = json_loads(blob)
+    except (ValueError, RecursionError):
+        # Invalid JSON or UTF-8 (both decoders raise ValueError subclasses), or
+        # nesting too deep for stdlib json, which raises RecursionError.
+        # Keep serving the last good config; fail closed to defaults otherwise.
+        return _last_good or _DEFAULT
+
+    if not isinstance(raw, Mapping):
+        return _last_good or _DEFAULT
+
+    # An empty object is a valid "use the defaults" config.
+    if not raw:
+        _last_good = _DEFAULT
+        return _DEFAULT
+
+    # The first valid value among each field's aliases wins.
+    overrides = {}
+    for field, aliases in _FIELDS:
+        for key in aliases:
+            value = raw.get(key)
+            if isinstance(value, str) and value.strip():
+                overrides[field] = value.strip()
+                break
+
+    # Build the Config once; missing/invalid fields keep their defaults.
+    cfg = Config(**overrides) if overrides else _DEFAULT
+
+    _last_good = cfg
     return cfg
+
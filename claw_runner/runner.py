@@ -1,22 +1,22 @@
 import asyncio
-import json
+import functools
 import logging
 import os
 import re
 import shlex
 import shutil
-import subprocess
-import webbrowser
+import signal
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
-from dbus_next import Variant
-from dbus_next.aio import MessageBus
-from dbus_next.service import ServiceInterface, method
+from dbus_fast import Variant
+from dbus_fast.aio import MessageBus
+from dbus_fast.service import ServiceInterface, method
 
-from claw_runner.config import load_config
+from claw_runner.config import CONFIG_PATH, json_dumps_pretty, json_loads, load_config
 
 
 # KRunner DBus interface docs:
@@ -26,17 +26,87 @@ from claw_runner.config import load_config
 
 log = logging.getLogger("claw-runner")
 
+# KRunner actions, as (id, text, iconName). Constant; Actions() returns it as-is
+# (the bus only reads it while marshalling the reply).
+_ACTIONS = [
+    ["open", "Open", "applications-internet"],
+    ["notify", "Notify", "dialog-information"],
+    ["terminal", "Open in terminal", "utilities-terminal"],
+    ["start", "Start", "media-playback-start"],
+    ["stop", "Stop", "media-playback-stop"],
+    ["restart", "Restart", "view-refresh"],
+]
+
+# Per-user paths, expanded once; $HOME does not change under a running service.
+_NVM_NODE_DIR = os.path.expanduser("~/.nvm/versions/node")
+
+# Fallback install locations probed by _resolve_cli after PATH and nvm.
+_COMMON_BIN_DIRS = (
+    os.path.expanduser("~/.local/bin"),
+    "/usr/local/bin",
+    "/usr/bin",
+)
+
+# Plain-text `<cli> status` parsing. Compiled once; labels are a fixed set.
+# Matches are case-insensitive ("Gateway" also covers "gateway").
+# Horizontal whitespace only: a blank value must not swallow the next line.
+_STATUS_LINE_RE = re.compile(r"(?im)^[ \t]*(Gateway|Telegram|TG|WhatsApp|WA|Sessions)[ \t]*:[ \t]*([^\n]*)$")
+_LEADING_INT_RE = re.compile(r"\d+\b")
+_STATUS_TABLE_RES = {
+    label: re.compile(rf"(?m)^│\s*{re.escape(label)}\s*│.*?│\s*([A-Z]+)\s*│")
+    for label in ("Telegram", "WhatsApp")
+}
+
+# `<cli> status --help` output: only trusted when it looks like help, so a CLI
+# that ignores --help and prints plain status isn't read as "no flags".
+_HELP_TEXT_RE = re.compile(r"(?i)\busage\b|(?<![\w-])--help(?![\w-])")
+
+# How long a concise status summary is reused for repeated status popups.
+_STATUS_TTL_S = 2.5
+
+# `<cli> status` flag styles for JSON output, in order of preference.
+_STATUS_JSON_STYLES: Tuple[Tuple[str, ...], ...] = (
+    ("--json",),
+    ("--format", "json"),
+)
+
+# Desktop notifications (same service notify-send talks to).
+_NOTIFY_BUS_NAME = "org.freedesktop.Notifications"
+_NOTIFY_PATH = "/org/freedesktop/Notifications"
+# A wedged notification daemon must not hold Run(); fall back to the CLIs.
+_NOTIFY_TIMEOUT_S = 2.0
+
+# How long resolved CLI/terminal lookups are reused before probing again.
+_RESOLVE_TTL_S = 30.0
+
+
+def _help_lists_flag(help_text: str, flag: str) -> bool:
+    # Whole-token match: "--all" must not match "--allow-unconfigured".
+    return re.search(rf"(?<![\w-]){re.escape(flag)}(?![\w-])", help_text) is not None
+
 
 def _split_cmd(cmd: str) -> List[str]:
     # shlex.split handles quoted terminal command strings from config.json
     return shlex.split(cmd) if cmd.strip() else []
 
 
+# Found executables, by name. PATH is fixed for the service's lifetime, so hits
+# are kept; misses are not, so a newly installed tool is seen on the next
+# lookup. SIGHUP clears it (e.g. after a tool moves).
+_which_cache: Dict[str, str] = {}
+
+
 def _which_or_none(name: str) -> Optional[str]:
+    found = _which_cache.get(name)
+    if found is not None:
+        return found
     try:
-        return shutil.which(name)
+        found = shutil.which(name)
     except Exception:
         return None
+    if found:
+        _which_cache[name] = found
+    return found
 
 
 @dataclass(frozen=True)
@@ -47,6 +117,15 @@ class ResolvedCli:
     configured: str
 
 
+@dataclass(frozen=True)
+class CliCaps:
+    # `<cli> status --all` is accepted
+    status_all: bool
+    # Extra `status` args that select JSON output, or None if unknown (probe
+    # every style in _STATUS_JSON_STYLES).
+    status_json_args: Optional[Tuple[str, ...]] = None
+
+
 def _parse_semver_from_nvm_dirname(name: str) -> Tuple[int, int, int]:
     # nvm uses names like v22.14.0
     m = re.match(r"^v(\d+)\.(\d+)\.(\d+)$", name)
@@ -74,7 +153,7 @@ def _resolve_cli(cli: str) -> ResolvedCli:
 
     # Relative path containing a slash: resolve relative to HOME.
     if ("/" in expanded) and not os.path.isabs(expanded):
-        p = Path(expanded).expanduser().resolve()
+        p = Path(expanded).resolve()
         return ResolvedCli(path=str(p), found=os.access(str(p), os.X_OK), configured=configured)
 
     # Otherwise treat as a binary name.
@@ -88,32 +167,26 @@ def _resolve_cli(cli: str) -> ResolvedCli:
             return ResolvedCli(path=found, found=True, configured=configured)
 
     # 2) nvm installs: ~/.nvm/versions/node/*/bin/<name> (prefer newest)
-    nvm_root = Path(os.path.expanduser("~/.nvm/versions/node"))
-    nvm_hits: List[Tuple[Tuple[int, int, int], str]] = []
-    if nvm_root.exists():
-        for ver_dir in nvm_root.iterdir():
-            if not ver_dir.is_dir():
-                continue
-            ver = _parse_semver_from_nvm_dirname(ver_dir.name)
-            for name in names:
-                p = ver_dir / "bin" / name
-                if p.exists() and os.access(str(p), os.X_OK):
-                    nvm_hits.append((ver, str(p)))
-    if nvm_hits:
-        nvm_hits.sort(key=lambda t: t[0], reverse=True)
-        return ResolvedCli(path=nvm_hits[0][1], found=True, configured=configured)
+    try:
+        with os.scandir(_NVM_NODE_DIR) as it:
+            ver_dirs = [(_parse_semver_from_nvm_dirname(e.name), e.path) for e in it if e.is_dir()]
+    except OSError:
+        ver_dirs = []
+    # Newest first; the first executable hit wins, so no need to collect them all.
+    ver_dirs.sort(key=lambda t: t[0], reverse=True)
+    for _, ver_dir in ver_dirs:
+        for name in names:
+            # os.access(X_OK) fails for missing files too; no separate exists().
+            p = os.path.join(ver_dir, "bin", name)
+            if os.access(p, os.X_OK):
+                return ResolvedCli(path=p, found=True, configured=configured)
 
     # 3) common locations
-    common_dirs = [
-        Path(os.path.expanduser("~/.local/bin")),
-        Path("/usr/local/bin"),
-        Path("/usr/bin"),
-    ]
-    for d in common_dirs:
+    for d in _COMMON_BIN_DIRS:
         for name in names:
-            p = d / name
-            if p.exists() and os.access(str(p), os.X_OK):
-                return ResolvedCli(path=str(p), found=True, configured=configured)
+            p = os.path.join(d, name)
+            if os.access(p, os.X_OK):
+                return ResolvedCli(path=p, found=True, configured=configured)
 
     # Not found
     return ResolvedCli(path=primary, found=False, configured=configured)
@@ -166,46 +239,106 @@ def _terminal_argv(terminal_cmd: str, shell_cmd: str) -> List[str]:
     if "{cmd}" in terminal_cmd:
         return _split_cmd(terminal_cmd.replace("{cmd}", shlex.quote(shell_cmd)))
 
-    term = _split_cmd(terminal_cmd)
-    if not term:
+    prefix = _terminal_prefix(terminal_cmd)
+    if not prefix:
         return []
+    return [*prefix, shell_cmd]
+
+
+@functools.lru_cache(maxsize=16)
+def _terminal_prefix(terminal_cmd: str) -> Tuple[str, ...]:
+    """argv up to (not including) the shell command, per terminal flavour.
+
+    Cached: the terminal string comes from config and rarely changes, and
+    shlex.split is a pure-Python lexer.
+    """
+
+    term = tuple(_split_cmd(terminal_cmd))
+    if not term:
+        return ()
 
     exe = os.path.basename(term[0])
 
     if exe == "kitty":
-        return term + ["--hold", "sh", "-lc", shell_cmd]
+        return term + ("--hold", "sh", "-lc")
 
     if exe == "konsole":
         # --hold keeps Konsole open after the command exits.
-        return term + ["--hold", "-e", "sh", "-lc", shell_cmd]
+        return term + ("--hold", "-e", "sh", "-lc")
 
     if exe == "gnome-terminal":
         # gnome-terminal uses "--" separator.
-        return term + ["--", "bash", "-lc", shell_cmd]
+        return term + ("--", "bash", "-lc")
 
     if exe == "xterm":
-        return term + ["-hold", "-e", "sh", "-lc", shell_cmd]
+        return term + ("-hold", "-e", "sh", "-lc")
 
     # Generic terminals typically accept -e.
-    return term + ["-e", "sh", "-lc", shell_cmd]
+    return term + ("-e", "sh", "-lc")
+
 
+# Upper bound on waiting for a killed probe's pipes to close. wait() only
+# returns once every holder of stdout/stderr has gone; a child that escaped its
+# process group (setsid) could otherwise hold the caller past its timeout.
+_REAP_TIMEOUT_S = 0.5
 
-def _run(
+
+async def _kill_and_reap(proc: "asyncio.subprocess.Process") -> None:
+    # Probes run in their own session, so this also takes down any
+    # grandchildren still sitting on the pipes. The child may have exited
+    # between the timeout/cancel and here.
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    try:
+        await asyncio.wait_for(proc.wait(), _REAP_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        # The child watcher still reaps the process itself; stop waiting.
+        pass
+
+
+async def _run_bytes(
     args: Sequence[str],
     timeout_s: float = 2.0,
-) -> Tuple[int, str, str]:
+) -> Tuple[int, bytes, bytes]:
+    # Async so a slow CLI never stalls the DBus event loop (and other Match calls).
     try:
-        proc = subprocess.run(
-            list(args),
-            text=True,
-            capture_output=True,
-            timeout=timeout_s,
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Own process group, so a timeout can kill the whole tree.
+            start_new_session=True,
         )
-        return proc.returncode, proc.stdout or "", proc.stderr or ""
-    except subprocess.TimeoutExpired as e:
-        return 124, e.stdout or "", e.stderr or "Timed out"
     except Exception as e:
-        return 127, "", str(e)
+        return 127, b"", str(e).encode()
+
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout_s)
+    except asyncio.TimeoutError:
+        await _kill_and_reap(proc)
+        return 124, b"", b"Timed out"
+    except asyncio.CancelledError:
+        # A competing probe won; don't leave the child running.
+        await _kill_and_reap(proc)
+        raise
+
+    return proc.returncode if proc.returncode is not None else 127, out, err
+
+
+async def _run(
+    args: Sequence[str],
+    timeout_s: float = 2.0,
+) -> Tuple[int, str, str]:
+    rc, out, err = await _run_bytes(args, timeout_s)
+    return rc, out.decode("utf-8", "replace"), err.decode("utf-8", "replace")
+
+
+async def _spawn(args: Sequence[str], **kwargs) -> None:
+    # Fire-and-forget launch (openers, notifications, terminals). The asyncio
+    # child watcher reaps the process when it exits; we don't wait for it.
+    await asyncio.create_subprocess_exec(*args, **kwargs)
 
 
 class KRunnerInterface(ServiceInterface):
@@ -213,35 +346,108 @@ class KRunnerInterface(ServiceInterface):
         super().__init__("org.kde.krunner1")
         self.config = load_config()
         self._activation_token: Optional[str] = None
+        # (monotonic timestamp, configured value, result) of the last lookup.
+        self._cli_cache: Optional[Tuple[float, str, ResolvedCli]] = None
+        self._terminal_cache: Optional[Tuple[float, str, str]] = None
+        # org.freedesktop.Notifications proxy, bound after the bus connects.
+        self._notify_proxy = None
+        # (monotonic timestamp, summary) of the last status-concise result.
+        self._status_cache: Optional[Tuple[float, str]] = None
+        # CLI path -> (binary mtime_ns, capabilities)
+        self._cli_caps: Dict[str, Tuple[int, CliCaps]] = {}
+        self._match_table = self._build_match_table()
+        self._run_dispatch = self._build_run_dispatch()
+
+    def _cached_resolve_cli(self) -> ResolvedCli:
+        # _resolve_cli walks PATH, nvm and common dirs; reuse it briefly.
+        configured = self.config.cli
+        cached = self._cli_cache
+        if cached and cached[1] == configured and time.monotonic() - cached[0] < _RESOLVE_TTL_S:
+            return cached[2]
+        resolved = _resolve_cli(configured)
+        self._cli_cache = (time.monotonic(), configured, resolved)
+        return resolved
+
+    def _cached_resolve_terminal(self) -> str:
+        configured = self.config.terminal
+        cached = self._terminal_cache
+        if cached and cached[1] == configured and time.monotonic() - cached[0] < _RESOLVE_TTL_S:
+            return cached[2]
+        resolved = _resolve_terminal(configured)
+        self._terminal_cache = (time.monotonic(), configured, resolved)
+        return resolved
+
+    def _forget_resolved(self) -> None:
+        """Drop every remembered executable path and CLI probe (SIGHUP)."""
+
+        _which_cache.clear()
+        self._cli_cache = None
+        self._terminal_cache = None
+        self._cli_caps.clear()
+
+    async def _cli_capabilities(self, cli: str) -> CliCaps:
+        """Return what the installed CLI supports, probing until it answers.
+
+        Cached per path and invalidated when the binary's mtime changes
+        (e.g. after an upgrade).
+        """
 
-    @method()
-    def Actions(self) -> "a(sss)":
-        # Structure: (id, text, iconName)
-        return [
-            ["open", "Open", "applications-internet"],
-            ["notify", "Notify", "dialog-information"],
-            ["terminal", "Open in terminal", "utilities-terminal"],
-            ["start", "Start", "media-playback-start"],
-            ["stop", "Stop", "media-playback-stop"],
-            ["restart", "Restart", "view-refresh"],
-        ]
+        try:
+            mtime_ns = os.stat(cli).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+
+        cached = self._cli_caps.get(cli)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        # Ask for help and try the flag directly at the same time, so a first
+        # run costs at most one probe timeout (as the old --all check did).
+        help_probe = asyncio.ensure_future(_run([cli, "status", "--help"], timeout_s=1.5))
+        all_probe = asyncio.ensure_future(_run([cli, "status", "--all"], timeout_s=1.5))
+        try:
+            rc, out, err = await help_probe
+            help_text = f"{out}\n{err}"
+            if rc == 0 and _HELP_TEXT_RE.search(help_text):
+                # Help that doesn't name a JSON flag may just be terse;
+                # leave it unknown so both styles are still tried.
+                status_json_args = next(
+                    (args for args in _STATUS_JSON_STYLES if _help_lists_flag(help_text, args[0])),
+                    None,
+                )
+                caps = CliCaps(
+                    status_all=_help_lists_flag(help_text, "--all"),
+                    status_json_args=status_json_args,
+                )
+            else:
+                # No usable help output: go by whether the flag was accepted.
+                rc, _, _ = await all_probe
+                caps = CliCaps(status_all=rc == 0)
+                if rc in (124, 127):
+                    # Timed out or failed to start: not an answer, so probe
+                    # again next time rather than pinning plain `status`.
+                    return caps
+        finally:
+            all_probe.cancel()
+
+        self._cli_caps[cli] = (mtime_ns, caps)
+        return caps
 
     @method()
-    def Match(self, query: "s") -> "a(sssida{sv})":
-        q = (query or "").strip()
-        if not q:
-            return []
+    def Actions(self) -> "a(sss)":
+        return _ACTIONS
 
-        if not q.lower().startswith("claw"):
-            return []
+    def _build_match_table(self) -> Dict[str, list]:
+        """Build every KRunner match row once.
 
-        url = self.config.dashboard_url
-        query_l = q.lower().strip()
+        Rows only depend on config, which is fixed for the interface's
+        lifetime, so Match() can hand out the same lists (and Variants).
+        """
 
         # KRunner::QueryMatch::Type values (common): ExactMatch=100
         EXACT_MATCH = 100
 
-        matches = []
+        table: Dict[str, list] = {}
 
         def add_match(
             mid: str,
@@ -255,126 +461,177 @@ class KRunnerInterface(ServiceInterface):
                 "subtext": Variant("s", subtext),
                 "actions": Variant("as", actions),
             }
-            matches.append([mid, text, icon, EXACT_MATCH, relevance, props])
+            table[mid] = [mid, text, icon, EXACT_MATCH, relevance, props]
 
-        # Dashboard is always available when user types "claw".
         add_match(
             "open-dashboard",
             "Open OpenClaw dashboard",
             "applications-internet",
             1.0,
-            url,
+            self.config.dashboard_url,
+            ["open"],
+        )
+        add_match(
+            "status-concise",
+            "Status (concise)",
+            "dialog-information",
+            0.92,
+            "Gateway/TG/WA/Sessions summary",
+            ["notify"],
+        )
+        add_match(
+            "status-verbose",
+            "Status (verbose)",
+            "utilities-terminal",
+            0.90,
+            "Open terminal: <cli> status (--all if available)",
+            ["terminal"],
+        )
+        add_match(
+            "gateway-start",
+            "Gateway: start",
+            "network-server",
+            0.865,
+            f"systemctl --user start {self.config.gateway_service}",
+            [],
+        )
+        add_match(
+            "gateway-stop",
+            "Gateway: stop",
+            "network-server",
+            0.864,
+            f"systemctl --user stop {self.config.gateway_service}",
+            [],
+        )
+        add_match(
+            "gateway-restart",
+            "Gateway: restart",
+            "network-server",
+            0.863,
+            f"systemctl --user restart {self.config.gateway_service}",
+            [],
+        )
+        # Daemon actions intentionally removed (v0): keep KRunner surface area focused on the gateway.
+        add_match(
+            "logs-gateway",
+            "Follow gateway logs",
+            "text-x-log",
+            0.80,
+            f"journalctl --user -u {self.config.gateway_service} -f",
+            ["terminal"],
+        )
+        # (daemon log action removed in v0)
+        add_match(
+            "logs-runner",
+            "Follow claw-runner logs",
+            "text-x-log",
+            0.78,
+            "journalctl --user -u claw-runner.service -f",
+            ["terminal"],
+        )
+        add_match(
+            "open-config",
+            "Open config",
+            "document-edit",
+            0.76,
+            "~/.config/claw-runner/config.json",
             ["open"],
         )
+        add_match(
+            "memory",
+            "Memory status",
+            "utilities-system-monitor",
+            0.74,
+            "Open terminal: <cli> status --all",
+            ["terminal"],
+        )
+
+        return table
+
+    @method()
+    def Match(self, query: "s") -> "a(sssida{sv})":
+        q = (query or "").strip()
+        if not q:
+            return []
+
+        # Most queries KRunner sends aren't for us; only lowercase the 4-char
+        # prefix to reject them, not the whole string.
+        if q[:4].lower() != "claw":
+            return []
+
+        query_l = q.lower()
+        bare = query_l in ("claw", "claw ")
+        rows = self._match_table
 
-        wants_status = query_l in ("claw", "claw ") or "status" in query_l or "health" in query_l
+        # Dashboard is always available when user types "claw".
+        matches = [rows["open-dashboard"]]
+
+        wants_status = bare or "status" in query_l or "health" in query_l
         wants_gateway = "gateway" in query_l
         wants_logs = "log" in query_l or "journal" in query_l
         wants_config = "config" in query_l
-        wants_memory = "memory" in query_l or "mem" in query_l
+        wants_memory = "mem" in query_l  # also covers "memory"
 
         if wants_status:
-            add_match(
-                "status-concise",
-                "Status (concise)",
-                "dialog-information",
-                0.92,
-                "Gateway/TG/WA/Sessions summary",
-                ["notify"],
-            )
-            add_match(
-                "status-verbose",
-                "Status (verbose)",
-                "utilities-terminal",
-                0.90,
-                "Open terminal: <cli> status (--all if available)",
-                ["terminal"],
-            )
+            matches += (rows["status-concise"], rows["status-verbose"])
 
-        if wants_gateway or (query_l in ("claw", "claw ")):
-            add_match(
-                "gateway-start",
-                "Gateway: start",
-                "network-server",
-                0.865,
-                f"systemctl --user start {self.config.gateway_service}",
-                [],
-            )
-            add_match(
-                "gateway-stop",
-                "Gateway: stop",
-                "network-server",
-                0.864,
-                f"systemctl --user stop {self.config.gateway_service}",
-                [],
-            )
-            add_match(
-                "gateway-restart",
-                "Gateway: restart",
-                "network-server",
-                0.863,
-                f"systemctl --user restart {self.config.gateway_service}",
-                [],
-            )
+        if wants_gateway or bare:
+            matches += (rows["gateway-start"], rows["gateway-stop"], rows["gateway-restart"])
 
-        # Daemon actions intentionally removed (v0): keep KRunner surface area focused on the gateway.
+        if wants_logs or bare:
+            matches += (rows["logs-gateway"], rows["logs-runner"])
 
-        if wants_logs or (query_l in ("claw", "claw ")):
-            add_match(
-                "logs-gateway",
-                "Follow gateway logs",
-                "text-x-log",
-                0.80,
-                f"journalctl --user -u {self.config.gateway_service} -f",
-                ["terminal"],
-            )
-            # (daemon log action removed in v0)
-            add_match(
-                "logs-runner",
-                "Follow claw-runner logs",
-                "text-x-log",
-                0.78,
-                "journalctl --user -u claw-runner.service -f",
-                ["terminal"],
-            )
+        if wants_config or bare:
+            matches.append(rows["open-config"])
 
-        if wants_config or (query_l in ("claw", "claw ")):
-            add_match(
-                "open-config",
-                "Open config",
-                "document-edit",
-                0.76,
-                "~/.config/claw-runner/config.json",
-                ["open"],
-            )
-
-        if wants_memory or (query_l in ("claw", "claw ")):
-            add_match(
-                "memory",
-                "Memory status",
-                "utilities-system-monitor",
-                0.74,
-                "Open terminal: <cli> status --all",
-                ["terminal"],
-            )
+        if wants_memory or bare:
+            matches.append(rows["memory"])
 
         return matches
 
-    def _notify(self, message: str, seconds: int = 3) -> None:
-        # Best-effort: kdialog → notify-send → logs
+    async def _connect_notifications(self, bus: MessageBus) -> None:
+        """Bind org.freedesktop.Notifications on our existing bus connection.
+
+        Lets _notify skip a kdialog/notify-send fork+exec per message. Best
+        effort: on any failure we keep using the subprocess fallbacks.
+        """
+
+        try:
+            intro = await bus.introspect(_NOTIFY_BUS_NAME, _NOTIFY_PATH, timeout=2.0)
+            obj = bus.get_proxy_object(_NOTIFY_BUS_NAME, _NOTIFY_PATH, intro)
+            self._notify_proxy = obj.get_interface(_NOTIFY_BUS_NAME)
+        except Exception as e:
+            log.info("notifications service unavailable, using CLI fallbacks: %s", e)
+
+    async def _notify(self, message: str, seconds: int = 3) -> None:
+        # Best-effort: DBus Notifications → kdialog → notify-send → logs
         log.info("notify: %s", message)
+        if self._notify_proxy is not None:
+            try:
+                # Notify(app_name, replaces_id, app_icon, summary, body, actions, hints, expire_timeout_ms)
+                await asyncio.wait_for(
+                    self._notify_proxy.call_notify(
+                        "claw-runner", 0, "", "claw-runner", message, [], {}, seconds * 1000
+                    ),
+                    _NOTIFY_TIMEOUT_S,
+                )
+                return
+            except asyncio.TimeoutError:
+                log.warning("Notify over DBus timed out after %.1fs", _NOTIFY_TIMEOUT_S)
+            except Exception:
+                log.exception("Notify over DBus failed")
         try:
             if _which_or_none("kdialog"):
-                subprocess.Popen(["kdialog", "--passivepopup", message, str(seconds)])
+                await _spawn(["kdialog", "--passivepopup", message, str(seconds)])
                 return
             if _which_or_none("notify-send"):
-                subprocess.Popen(["notify-send", "claw-runner", message])
+                await _spawn(["notify-send", "claw-runner", message])
                 return
         except Exception:
             # Never crash the runner for notification failures.
             return
 
-    def _open_url(self, url: str) -> None:
+    async def _open_url(self, url: str) -> None:
         """Open a URL using a desktop handler.
 
         Security note: we avoid passing option-like values (e.g. "-foo") to openers.
@@ -388,12 +645,12 @@ class KRunnerInterface(ServiceInterface):
         # Be conservative: only allow common safe schemes.
         scheme = urlparse(url).scheme.lower()
         if scheme and scheme not in {"http", "https", "file"}:
-            self._notify(f"Blocked URL scheme: {scheme}")
+            await self._notify(f"Blocked URL scheme: {scheme}")
             return
 
-        env = os.environ.copy()
-        if self._activation_token:
-            env["XDG_ACTIVATION_TOKEN"] = self._activation_token
+        # Only build a custom environment when there is a token to add;
+        # env=None lets the child inherit ours without copying it.
+        env = {**os.environ, "XDG_ACTIVATION_TOKEN": self._activation_token} if self._activation_token else None
 
         candidates = [
             ["xdg-open", url],
@@ -406,47 +663,53 @@ class KRunnerInterface(ServiceInterface):
             exe = cmd[0]
             if _which_or_none(exe):
                 try:
-                    subprocess.Popen(cmd, env=env, start_new_session=True)
+                    await _spawn(cmd, env=env, start_new_session=True)
                     return
                 except Exception:
                     continue
 
-        # Last resort: let python pick a handler.
+        # Last resort: let python pick a handler. Imported here since this
+        # almost never runs and webbrowser is a heavy import.
         try:
+            import webbrowser
+
             webbrowser.open(url, new=0)
         except Exception:
             pass
 
-    def _open_file(self, path: str) -> None:
+    async def _open_file(self, path: str) -> None:
         try:
             uri = Path(os.path.expanduser(path)).resolve().as_uri()
         except Exception:
             return
-        self._open_url(uri)
+        await self._open_url(uri)
 
     def _ensure_default_config_file(self) -> Path:
-        cfg_path = Path(os.path.expanduser("~/.config/claw-runner/config.json"))
+        cfg_path = Path(CONFIG_PATH)
         cfg_path.parent.mkdir(parents=True, exist_ok=True)
-        if not cfg_path.exists():
-            cfg_path.write_text(
-                json.dumps(
+        try:
+            # O_EXCL: create-if-missing in one step, never clobbering a file the
+            # user (or a concurrent Run) just wrote.
+            fd = os.open(cfg_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            return cfg_path
+        with os.fdopen(fd, "wb") as f:
+            f.write(
+                json_dumps_pretty(
                     {
                         "dashboardUrl": self.config.dashboard_url,
                         "cli": self.config.cli,
                         "gatewayService": self.config.gateway_service,
                         "terminal": self.config.terminal,
-                    },
-                    indent=2,
+                    }
                 )
-                + "\n",
-                encoding="utf-8",
             )
         return cfg_path
 
-    def _open_terminal(self, command: Sequence[str], title: str = "") -> None:
-        terminal_cmd = _resolve_terminal(self.config.terminal)
+    async def _open_terminal(self, command: Sequence[str], title: str = "") -> None:
+        terminal_cmd = self._cached_resolve_terminal()
         if not terminal_cmd:
-            self._notify("No terminal emulator found")
+            await self._notify("No terminal emulator found")
             return
 
         # Keep the terminal open after the command finishes.
@@ -455,21 +718,21 @@ class KRunnerInterface(ServiceInterface):
 
         argv = _terminal_argv(terminal_cmd, shell_cmd)
         if not argv:
-            self._notify("No terminal emulator found")
+            await self._notify("No terminal emulator found")
             return
 
         try:
-            subprocess.Popen(list(argv), start_new_session=True)
+            await _spawn(argv, start_new_session=True)
         except Exception as e:
             log.exception("Failed to open terminal")
-            self._notify(f"Failed to open terminal: {e}")
+            await self._notify(f"Failed to open terminal: {e}")
 
-    def _systemctl_user(self, verb: str, unit: str) -> Tuple[bool, str]:
+    async def _systemctl_user(self, verb: str, unit: str) -> Tuple[bool, str]:
         unit = (unit or "").strip()
         if not unit:
             return False, "No unit configured"
 
-        rc, out, err = _run(["systemctl", "--user", verb, unit], timeout_s=8.0)
+        rc, out, err = await _run(["systemctl", "--user", verb, unit], timeout_s=8.0)
         if rc == 0:
             return True, f"{verb} {unit}: OK"
         msg = (err.strip() or out.strip() or f"systemctl rc={rc}").strip()
@@ -484,43 +747,72 @@ class KRunnerInterface(ServiceInterface):
         #  Sessions: 3
         res: Dict[str, object] = {}
 
-        def find_state(label: str) -> Optional[str]:
-            m = re.search(rf"(?im)^\s*{re.escape(label)}\s*:\s*([^\n]+)$", text)
-            if not m:
-                return None
-            return m.group(1).strip()
+        # One pass over the text; the first non-blank value for each label wins.
+        found: Dict[str, str] = {}
+        for label, value in _STATUS_LINE_RE.findall(text):
+            label = label.lower()
+            value = value.strip()
+            if not value:
+                continue
+            if label == "sessions":
+                m = _LEADING_INT_RE.match(value)
+                if m and label not in found:
+                    found[label] = m.group(0)
+            else:
+                found.setdefault(label, value)
 
-        res["gateway"] = find_state("Gateway") or find_state("gateway")
-        res["telegram"] = find_state("Telegram") or find_state("TG")
-        res["whatsapp"] = find_state("WhatsApp") or find_state("WA")
+        res["gateway"] = found.get("gateway")
+        res["telegram"] = found.get("telegram") or found.get("tg")
+        res["whatsapp"] = found.get("whatsapp") or found.get("wa")
 
-        m = re.search(r"(?im)^\s*Sessions\s*:\s*(\d+)\b", text)
-        if m:
-            try:
-                res["sessions"] = int(m.group(1))
-            except Exception:
-                pass
+        if "sessions" in found:
+            res["sessions"] = int(found["sessions"])
 
         return res
 
-    def _status_summary(self) -> str:
-        cli_info = _resolve_cli(self.config.cli)
+    async def _status_summary(self) -> str:
+        cli_info = self._cached_resolve_cli()
         if not cli_info.found:
             return f"CLI not found ({cli_info.configured}). Set 'cli' in ~/.config/claw-runner/config.json"
         cli = cli_info.path
 
-        # Prefer JSON if supported.
-        for args in (
-            [cli, "status", "--json"],
-            [cli, "status", "--format", "json"],
-        ):
-            # Be generous here: on some machines the CLI can take a moment
-            # (initialisation, disk wake, etc.). If this times out, we fall back.
-            rc, out, err = _run(args, timeout_s=8.0)
+        # Repeated status popups in quick succession reuse the last summary.
+        cached = self._status_cache
+        if cached and time.monotonic() - cached[0] < _STATUS_TTL_S:
+            return cached[1]
+
+        summary = await self._compute_status_summary(cli)
+        self._status_cache = (time.monotonic(), summary)
+        return summary
+
+    async def _compute_status_summary(self, cli: str) -> str:
+        # Prefer JSON if supported. When the CLI's help told us which flag style
+        # it takes, run only that; otherwise probe both concurrently so a CLI
+        # that rejects the first doesn't cost two sequential startups (the
+        # first one still wins when both succeed).
+        caps = await self._cli_capabilities(cli)
+        if caps.status_json_args is None:
+            json_styles: Sequence[Tuple[str, ...]] = _STATUS_JSON_STYLES
+        else:
+            json_styles = (caps.status_json_args,)
+
+        # Be generous here: on some machines the CLI can take a moment
+        # (initialisation, disk wake, etc.). If this times out, we fall back.
+        # Raw bytes: both JSON decoders take UTF-8 bytes, so skip a text decode.
+        probes = [asyncio.ensure_future(_run_bytes([cli, "status", *args], timeout_s=8.0)) for args in json_styles]
+        try:
+            return await self._status_summary_json(probes) or await self._status_summary_text(cli)
+        finally:
+            for probe in probes:
+                probe.cancel()
+
+    async def _status_summary_json(self, probes: List[asyncio.Future]) -> Optional[str]:
+        for probe in probes:
+            rc, out, err = await probe
             if rc != 0 or not out.strip():
                 continue
             try:
-                data = json.loads(out)
+                data = json_loads(out)
             except Exception:
                 continue
 
@@ -551,28 +843,34 @@ class KRunnerInterface(ServiceInterface):
             tg: str = "?"
             wa: str = "?"
 
+            # Both loops stop as soon as they have seen Telegram and WhatsApp.
             channels = data.get("channels") or data.get("channelStatus") or []
             if isinstance(channels, list):
+                seen_tg = seen_wa = False
                 for c in channels:
                     if not isinstance(c, dict):
                         continue
                     c_name = (c.get("channel") or c.get("name") or "").lower()
-                    state = normalize_chan_state(c.get("state") or c.get("status"))
                     if c_name == "telegram":
-                        tg = state
-                    if c_name == "whatsapp":
-                        wa = state
+                        tg, seen_tg = normalize_chan_state(c.get("state") or c.get("status")), True
+                    elif c_name == "whatsapp":
+                        wa, seen_wa = normalize_chan_state(c.get("state") or c.get("status")), True
+                    if seen_tg and seen_wa:
+                        break
 
             # Most current clawdbot builds expose channel state via channelSummary.
             summary = data.get("channelSummary")
             if isinstance(summary, list):
+                seen_tg = seen_wa = False
                 for line in summary:
                     if not isinstance(line, str):
                         continue
                     if line.startswith("Telegram:"):
-                        tg = normalize_chan_state(line.split(":", 1)[1])
-                    if line.startswith("WhatsApp:"):
-                        wa = normalize_chan_state(line.split(":", 1)[1])
+                        tg, seen_tg = normalize_chan_state(line.split(":", 1)[1]), True
+                    elif line.startswith("WhatsApp:"):
+                        wa, seen_wa = normalize_chan_state(line.split(":", 1)[1]), True
+                    if seen_tg and seen_wa:
+                        break
 
             # WhatsApp can also appear as the "linkChannel".
             link_channel = data.get("linkChannel")
@@ -598,8 +896,11 @@ class KRunnerInterface(ServiceInterface):
                 parts.append(f"Sessions {session_count}")
             return " · ".join(parts)
 
+        return None
+
+    async def _status_summary_text(self, cli: str) -> str:
         # Fallback to plain text.
-        rc, out, err = _run([cli, "status"], timeout_s=4.0)
+        rc, out, err = await _run([cli, "status"], timeout_s=4.0)
         if rc != 0:
             msg = (err.strip() or out.strip() or "unavailable").strip()
             return f"Status: {msg}"
@@ -614,7 +915,7 @@ class KRunnerInterface(ServiceInterface):
         # state from those tables if our simple "Label: value" parsing failed.
         if tg == "?" or wa == "?":
             def table_state(label: str) -> Optional[str]:
-                m = re.search(rf"(?m)^│\s*{re.escape(label)}\s*│.*?│\s*([A-Z]+)\s*│", out)
+                m = _STATUS_TABLE_RES[label].search(out)
                 if not m:
                     return None
                 return m.group(1).strip().upper()
@@ -636,68 +937,82 @@ class KRunnerInterface(ServiceInterface):
         # Plasma passes an XDG activation token for proper focus-stealing prevention.
         self._activation_token = (token or "").strip() or None
 
-    @method()
-    def Run(self, matchId: "s", actionId: "s") -> None:
-        # actionId is empty when user hits Enter; otherwise one of Actions().
-        try:
-            log.info("Run matchId=%s actionId=%s", matchId, actionId)
-
-            if matchId == "open-dashboard":
-                self._open_url(self.config.dashboard_url)
-                return
+    def _build_run_dispatch(self) -> Dict[str, Callable[[], Awaitable[None]]]:
+        # matchId -> handler; grouped ids share a handler with a bound argument.
+        return {
+            "open-dashboard": self._run_open_dashboard,
+            "open-config": self._run_open_config,
+            "status-concise": self._run_status_concise,
+            "status-verbose": self._run_status_verbose,
+            "memory": self._run_status_verbose,
+            "logs-gateway": functools.partial(self._run_follow_logs, self.config.gateway_service),
+            # (daemon log action removed in v0)
+            "logs-runner": functools.partial(self._run_follow_logs, "claw-runner.service"),
+            "gateway-start": functools.partial(self._run_gateway, "start"),
+            "gateway-stop": functools.partial(self._run_gateway, "stop"),
+            "gateway-restart": functools.partial(self._run_gateway, "restart"),
+        }
 
-            if matchId == "open-config":
-                p = self._ensure_default_config_file()
-                self._open_file(str(p))
-                self._notify(f"Config: {p}")
-                return
+    async def _run_open_dashboard(self) -> None:
+        await self._open_url(self.config.dashboard_url)
 
-            if matchId == "status-concise":
-                self._notify(self._status_summary())
-                return
+    async def _run_open_config(self) -> None:
+        p = self._ensure_default_config_file()
+        await self._open_file(str(p))
+        await self._notify(f"Config: {p}")
 
-            if matchId in ("status-verbose", "memory"):
-                cli_info = _resolve_cli(self.config.cli)
-                if not cli_info.found:
-                    self._notify(
-                        f"CLI not found ({cli_info.configured}). Set 'cli' in ~/.config/claw-runner/config.json",
-                        seconds=6,
-                    )
-                    return
-                cli = cli_info.path
-                # Prefer --all if supported; otherwise plain status.
-                rc, out, _ = _run([cli, "status", "--all"], timeout_s=1.5)
-                cmd = [cli, "status", "--all"] if rc == 0 else [cli, "status"]
-                self._open_terminal(cmd)
-                return
+    async def _run_status_concise(self) -> None:
+        await self._notify(await self._status_summary())
 
-            if matchId == "logs-gateway":
-                self._open_terminal(["journalctl", "--user", "-u", self.config.gateway_service, "-f"])
-                return
-            # (daemon log action removed in v0)
-            if matchId == "logs-runner":
-                self._open_terminal(["journalctl", "--user", "-u", "claw-runner.service", "-f"])
-                return
+    async def _run_status_verbose(self) -> None:
+        cli_info = self._cached_resolve_cli()
+        if not cli_info.found:
+            await self._notify(
+                f"CLI not found ({cli_info.configured}). Set 'cli' in ~/.config/claw-runner/config.json",
+                seconds=6,
+            )
+            return
+        cli = cli_info.path
+        # Prefer --all if supported; otherwise plain status.
+        caps = await self._cli_capabilities(cli)
+        cmd = [cli, "status", "--all"] if caps.status_all else [cli, "status"]
+        await self._open_terminal(cmd)
+
+    async def _run_follow_logs(self, unit: str) -> None:
+        await self._open_terminal(["journalctl", "--user", "-u", unit, "-f"])
+
+    async def _run_gateway(self, verb: str) -> None:
+        unit = self.config.gateway_service
+        ok, msg = await self._systemctl_user(verb, unit)
+        # Gateway state just changed (or may have); don't serve a stale summary.
+        self._status_cache = None
+        await self._notify(f"Gateway: {msg}", seconds=3 if ok else 6)
+        log.info("systemctl action kind=gateway verb=%s unit=%s ok=%s", verb, unit, ok)
 
-            if matchId.startswith("gateway-"):
-                _, _, verb = matchId.partition("-")
-                verb = (verb or "restart").strip() or "restart"
-                if verb not in ("start", "stop", "restart"):
-                    verb = "restart"
+    @method()
+    async def Run(self, matchId: "s", actionId: "s") -> None:
+        # actionId is empty when user hits Enter; otherwise one of Actions().
+        try:
+            log.info("Run matchId=%s actionId=%s", matchId, actionId)
 
-                unit = self.config.gateway_service
-                ok, msg = self._systemctl_user(verb, unit)
-                self._notify(f"Gateway: {msg}", seconds=3 if ok else 6)
-                log.info("systemctl action kind=gateway verb=%s unit=%s ok=%s", verb, unit, ok)
-                return
+            handler = self._run_dispatch.get(matchId)
+            if handler is None and matchId.startswith("gateway-"):
+                # Unknown gateway verb: restart, as before.
+                handler = self._run_dispatch["gateway-restart"]
+            if handler is not None:
+                await handler()
 
         except Exception as e:
             log.exception("Run handler failed")
-            self._notify(f"claw-runner error: {e}")
+            await self._notify(f"claw-runner error: {e}")
             return
 
 
 async def main():
+    # The default format never shows thread/process info; skip collecting it per record.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     logging.basicConfig(level=os.environ.get("CLAW_RUNNER_LOGLEVEL", "INFO"))
 
     bus = await MessageBus().connect()
@@ -708,6 +1023,13 @@ async def main():
     iface = KRunnerInterface()
     bus.export("/runner", iface)
 
+    # Background setup; never delays startup. Keep a reference so the task
+    # can't be garbage-collected while it is still pending.
+    connect_task = asyncio.ensure_future(iface._connect_notifications(bus))
+
+    # SIGHUP (systemctl --user reload): forget remembered paths and CLI probes.
+    asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, iface._forget_resolved)
+
     log.info("claw-runner started")
 
     # Keep process alive.